@@ -1,40 +1,78 @@
 import argparse
 import asyncio
-import json
+import msgspec
+import orjson
 import os
 import sys
-from typing import AsyncGenerator, Dict, Any
+from typing import AsyncGenerator, Dict, Any, Optional
 from mfcs import MemoryCall, ToolCall
 from openai import AsyncOpenAI
 from mfcs.response_parser import ResponseParser
 from mfcs.function_prompt import FunctionPromptGenerator
 
+class ChoiceDelta(msgspec.Struct, omit_defaults=True):
+    content: Optional[str] = None
+    finish_reason: Optional[str] = None
+
+class ToolCallRec(msgspec.Struct, omit_defaults=True):
+    instructions: Optional[str] = None
+    name: Optional[str] = None
+    call_id: Optional[str] = None
+    arguments: Optional[Dict[str, Any]] = None
+
+class MemoryCallRec(msgspec.Struct, omit_defaults=True):
+    instructions: Optional[str] = None
+    name: Optional[str] = None
+    memory_id: Optional[str] = None
+    arguments: Optional[Dict[str, Any]] = None
+
+class Usage(msgspec.Struct, omit_defaults=True):
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+class StreamRecord(msgspec.Struct, omit_defaults=True):
+    """One streamed response line, encoded with a schema-driven encoder"""
+    model: str
+    test_case: str
+    reasoning_content: Optional[str] = None
+    choice_delta: Optional[ChoiceDelta] = None
+    tool_call: Optional[ToolCallRec] = None
+    memory_call: Optional[MemoryCallRec] = None
+    usage: Optional[Usage] = None
+
+_encoder = msgspec.json.Encoder()
+
 def load_config(config_path: str) -> Dict[str, Any]:
     """Load configuration from JSON file"""
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    # Binary mode: orjson decodes UTF-8 itself
+    with open(config_path, 'rb') as f:
+        return orjson.loads(f.read())
 
 def load_test_case(test_cases_dir: str, test_case_name: str) -> Dict[str, Any]:
-    """Load test case from JSON file"""
+    """Load test case from the harness (env) or from its JSON file"""
+    # The benchmark harness passes the already-parsed test case via env
+    payload = os.environ.get("MFCS_CASE_JSON")
+    if payload:
+        return orjson.loads(payload)
     test_case_path = os.path.join(test_cases_dir, test_case_name)
-    with open(test_case_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(test_case_path, 'rb') as f:
+        return orjson.loads(f.read())
 
-async def stream_llm_response(client: AsyncOpenAI, 
+async def stream_llm_response(client: AsyncOpenAI,
                             model: str,
                             messages: list,
                             test_case: str,
-                            tools: list = None) -> AsyncGenerator[Dict[str, Any], None]:
+                            function_prompt: str = None) -> AsyncGenerator["StreamRecord", None]:
     """Stream responses from OpenAI API"""
-    
+
     # Initialize MFCS components
     parser = ResponseParser()
-    
-    # Generate function prompt using MFCS if tools are provided
-    if tools:
-        function_prompt = FunctionPromptGenerator.generate_function_prompt(tools)
+
+    # Prepend the pre-generated function prompt if provided
+    if function_prompt:
         messages = [{"role": "system", "content": function_prompt}] + messages
-    
+
     # Configure the API call parameters
     params = {
         "model": model,
@@ -47,47 +85,44 @@ async def stream_llm_response(client: AsyncOpenAI,
         # Make the API call
         stream = await client.chat.completions.create(**params)
         async for delta, call_info, reasoning_content, usage in parser.parse_stream_output(stream):
-            # Initialize response structure
-            response = {
-                "model": model,
-                "test_case": test_case,
-                "reasoning_content": reasoning_content,
-                "choice_delta": None,
-                "tool_call": None,
-                "memory_call": None,
-                "usage": None
-            }
+            record = StreamRecord(
+                model=model,
+                test_case=test_case,
+                reasoning_content=reasoning_content
+            )
 
             if delta:
-                response["choice_delta"] = {
-                    "content": delta.content,
-                    "finish_reason": delta.finish_reason
-                }
-
-            if call_info and isinstance(call_info, ToolCall):
-                response["tool_call"] = {
-                    "instructions": call_info.instructions,
-                    "name": call_info.name,
-                    "call_id": call_info.call_id,
-                    "arguments": call_info.arguments
-                }
-            
-            if call_info and isinstance(call_info, MemoryCall):
-                response["memory_call"] = {
-                    "instructions": call_info.instructions,
-                    "name": call_info.name,
-                    "memory_id": call_info.memory_id,
-                    "arguments": call_info.arguments
-                }
-            
+                record.choice_delta = ChoiceDelta(
+                    content=delta.content,
+                    finish_reason=delta.finish_reason
+                )
+
+            if call_info is not None:
+                # Exact type checks: the parser yields concrete ToolCall/MemoryCall instances
+                call_type = type(call_info)
+                if call_type is ToolCall:
+                    record.tool_call = ToolCallRec(
+                        instructions=call_info.instructions,
+                        name=call_info.name,
+                        call_id=call_info.call_id,
+                        arguments=call_info.arguments
+                    )
+                elif call_type is MemoryCall:
+                    record.memory_call = MemoryCallRec(
+                        instructions=call_info.instructions,
+                        name=call_info.name,
+                        memory_id=call_info.memory_id,
+                        arguments=call_info.arguments
+                    )
+
             if usage:
-                response["usage"] = {
-                    "prompt_tokens": usage.prompt_tokens,
-                    "completion_tokens": usage.completion_tokens,
-                    "total_tokens": usage.total_tokens
-                }
+                record.usage = Usage(
+                    prompt_tokens=usage.prompt_tokens,
+                    completion_tokens=usage.completion_tokens,
+                    total_tokens=usage.total_tokens
+                )
 
-            yield response
+            yield record
     except Exception as e:
         print(f"Error during streaming: {str(e)}")
         raise
@@ -103,9 +138,9 @@ async def main():
     parser.add_argument("--test_case_name", required=True, help="Name of test case file")
     args = parser.parse_args()
 
-    # Ensure UTF-8 encoding for stdout
-    if hasattr(sys.stdout, 'buffer'):
-        sys.stdout = open(sys.stdout.fileno(), mode='w', encoding='utf-8', buffering=1)
+    # Ensure UTF-8 encoding for stdout without replacing the stream object
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
 
     # Load configurations
     model_config_all = load_config(args.model)
@@ -137,15 +172,20 @@ async def main():
     else:
         tools = tools_config
 
+    # Generate the function prompt once for the chosen tools config
+    function_prompt = FunctionPromptGenerator.generate_function_prompt(tools) if tools else None
+
     # Stream responses
     async for response in stream_llm_response(
         client=client,
         model=args.model_name,
         messages=messages,
         test_case=args.test_case_name,
-        tools=tools
+        function_prompt=function_prompt
     ):
-        print(json.dumps(response, ensure_ascii=False), flush=True)
+        # Write bytes directly to avoid the bytes -> str -> bytes round-trip
+        sys.stdout.buffer.write(_encoder.encode(response) + b"\n")
+        sys.stdout.buffer.flush()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,22 +1,36 @@
 """
 MFCS Benchmark Runner
 """
-import json
+import functools
+import hashlib
+import io
+import mmap
 import os
+import pathlib
 import sys
 import argparse
 import logging
 from datetime import datetime
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import aiofiles
+import torch
 from sentence_transformers import SentenceTransformer
 
+from mfcs_bench import _json
 from mfcs_bench.core.processor import BenchmarkProcessor
 
+try:
+    # Optional: vectorized markdown table emission for large result matrices
+    import pandas as _pd
+except ImportError:
+    _pd = None
+
 def setup_logging(verbose: bool = False) -> None:
     """Setup logging configuration"""
     formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%H:%M:%S'
     )
     
     console_handler = logging.StreamHandler()
@@ -28,23 +42,70 @@ def setup_logging(verbose: bool = False) -> None:
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _load_json_cached(path):
+    """Load and parse a JSON file, memoized by path (treat the result as read-only)"""
+    with open(path, 'rb') as f:
+        return _json.loads(f.read())
+
+@functools.lru_cache(maxsize=1024)
+def _pct(x):
+    """Format a percentage; memoized since accuracies cluster on few values"""
+    return f"{x:.2f}%"
+
+@functools.lru_cache(maxsize=None)
+def _list_test_cases(test_cases_dir):
+    """List test case files in a directory, memoized per directory"""
+    with os.scandir(test_cases_dir) as it:
+        # Sorted for deterministic scheduling and report ordering
+        return sorted(e.name for e in it if e.is_file() and e.name.endswith('.json'))
+
+# Table scaffolding is assembled once at import; rows are emitted via str.format
+SUMMARY_TITLE = "# MFCS Evaluation Report\n\n## Summary\n\n"
+SUMMARY_COLUMNS = ("App Name", "Model", "Test Case", "Accuracy", "Response Time", "Pass Rate", "Tool Usage", "Result")
+SUMMARY_TABLE_HEADER = (
+    "| App Name | Model | Test Case | Accuracy | Response Time | Pass Rate | Tool Usage | Result |\n"
+    "|----------|--------|-----------|----------|---------------|-----------|------------|--------|\n"
+)
+SUMMARY_ROW_TMPL = "| {} | {} | {} | {} | {} | {} | {} | {} |\n"
+DETAIL_TABLE_HEADER = (
+    "| Test Case | Tool Usage | Required Content | Semantic Match | Accuracy |\n"
+    "|-----------|------------|------------------|----------------|----------|\n"
+)
+
 class BenchmarkRunner:
     """Main benchmark runner class"""
+
+    DEFAULT_MAX_CONCURRENCY = 16
     
-    def __init__(self, config_path="apps/config.json", reports_dir="reports", embedding_model_name_or_path=None, embedding_threshold=None):
+    def __init__(self, config_path="apps/config.json", reports_dir="reports", embedding_model_name_or_path=None, embedding_threshold=None, max_concurrency=None, cache_dir=None, thread_pool_size=None):
         """
         Initialize the benchmark runner
-        
+
         Args:
             config_path: Path to configuration file
             reports_dir: Directory to store reports
             embedding_model_name_or_path: Embedding model name or path
             embedding_threshold: Embedding similarity threshold
+            max_concurrency: Maximum number of concurrent benchmark tasks
+            cache_dir: Directory for cached results (None disables caching)
+            thread_pool_size: Worker count for the loop's default executor
+                (None keeps asyncio's default sizing)
         """
+        self.cache_dir = cache_dir
         self.config_path = config_path
         self.reports_dir = reports_dir
         self.embedding_model_name_or_path = embedding_model_name_or_path
         self.embedding_threshold = embedding_threshold
+        # Priority: argument > environment variable > default
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+        else:
+            self.max_concurrency = int(os.environ.get('MFCS_MAX_CONCURRENCY', self.DEFAULT_MAX_CONCURRENCY))
+        if thread_pool_size is not None:
+            self.thread_pool_size = thread_pool_size
+        else:
+            self.thread_pool_size = int(os.environ.get('MFCS_THREAD_POOL_SIZE', 0)) or None
         self.embedding_model = None
         # Load embedding model only once
         model_name = (
@@ -52,189 +113,396 @@ class BenchmarkRunner:
             os.environ.get('EMBEDDING_MODEL_NAME_OR_PATH')
         )
         if model_name:
-            self.embedding_model = SentenceTransformer(model_name)
+            # CPU encodes at tens of sentences/s; a GPU in half precision is
+            # orders of magnitude faster and loses nothing at our threshold
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.embedding_model = SentenceTransformer(model_name, device=device)
+            if device == "cuda":
+                self.embedding_model.half()
+            elif os.environ.get('MFCS_EMBEDDING_BF16'):
+                # Opt-in: halves weight bandwidth, but only pays off on CPUs
+                # with native bf16 (AVX512-BF16/AMX) — hence not the default
+                self.embedding_model.to(dtype=torch.bfloat16)
 
         self.load_config()
-        
-        # Ensure reports directory exists
+
+        # Ensure reports directory exists; path helpers derive from this once
+        self._reports_path = pathlib.Path(self.reports_dir)
         os.makedirs(self.reports_dir, exist_ok=True)
         # Load all model display names for all apps
         self.model_display_names = {}  # {model_id: "model_id (name)"}
         self._load_all_model_display_names()
+        # Batch-encode every expected semantic_match string once up front
+        self.expected_embeddings = self._precompute_expected_embeddings()
 
     def _load_all_model_display_names(self):
         """Load all model display names from all model config paths in apps config."""
         model_paths = set()
         for app_config in self.config.values():
-            for arg in app_config["args"]:
-                if arg.startswith("--model=") or arg.startswith("--models="):
-                    model_paths.add(arg.split("=", 1)[1])
+            parsed = app_config["_parsed"]
+            path = parsed.get("--model") or parsed.get("--models")
+            if path:
+                model_paths.add(path)
         for path in model_paths:
             if not os.path.exists(path):
                 continue
-            with open(path, 'r', encoding='utf-8') as f:
-                models = json.load(f)
-                for model_id, model_info in models.items():
-                    cn_name = model_info.get("name", "")
-                    if cn_name:
-                        self.model_display_names[model_id] = f"{model_id} ({cn_name})"
-                    else:
-                        self.model_display_names[model_id] = model_id
+            models = _load_json_cached(path)
+            for model_id, model_info in models.items():
+                cn_name = model_info.get("name", "")
+                if cn_name:
+                    self.model_display_names[model_id] = f"{model_id} ({cn_name})"
+                else:
+                    self.model_display_names[model_id] = model_id
 
     def get_model_display_name(self, model_id):
         return self.model_display_names.get(model_id, model_id)
 
+    def _precompute_expected_embeddings(self):
+        """Encode the unique expected semantic_match strings in one batch.
+
+        The same expected string is checked for every model that runs a test
+        case, so encoding it once here turns per-task encodes into dict
+        lookups inside the processor.
+        """
+        if self.embedding_model is None:
+            return {}
+        expected = set()
+        for app_config in self.config.values():
+            test_cases_dir = app_config["_parsed"].get("--test_cases")
+            if not test_cases_dir or not os.path.isdir(test_cases_dir):
+                continue
+            for test_case_file in _list_test_cases(test_cases_dir):
+                case = _load_json_cached(os.path.join(test_cases_dir, test_case_file))
+                match = case.get("expected_output", {}).get("semantic_match")
+                if match:
+                    expected.add(str(match))
+        if not expected:
+            return {}
+        # Length-sorted input keeps padding waste low within each batch
+        ordered = sorted(expected, key=len)
+        vectors = self.embedding_model.encode(
+            ordered,
+            batch_size=64,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        return dict(zip(ordered, vectors))
+
+    def _result_cache_path(self, app_config, model_entry, test_case_path):
+        """Cache file path keyed by the content that determines a result"""
+        key_src = _json.dumps({
+            "app": app_config,
+            "model": model_entry,
+            "case": _load_json_cached(test_case_path)
+        })
+        key = hashlib.sha256(key_src.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    @staticmethod
+    def _load_cached_result(cache_path):
+        """Return the cached result for cache_path, or None on miss/corruption"""
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                return _json.loads(f.read())
+        except (OSError, _json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _store_cached_result(cache_path, serializable_result):
+        """Atomically persist a result so interrupted writes never poison the cache"""
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(_json.dumps(serializable_result))
+        os.replace(tmp_path, cache_path)
+
+    _MMAP_THRESHOLD = 1024 * 1024  # configs beyond this are parsed straight from the page cache
+
     def load_config(self) -> None:
         """Load configuration from file"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
-            logger.info(f"Successfully loaded config file: {self.config_path}")
+            # Binary mode: the JSON backend decodes UTF-8 itself. Very large
+            # configs are mapped instead of read to avoid a second copy.
+            with open(self.config_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size > self._MMAP_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        self.config = _json.loads(memoryview(mm))
+                else:
+                    self.config = _json.loads(f.read())
+            self._index_app_args(self.config)
+            logger.info("Successfully loaded config file: %s", self.config_path)
         except Exception as e:
-            logger.error(f"Failed to load config file: {e}")
+            logger.error("Failed to load config file: %s", e)
             raise
 
     async def async_load_config(self) -> None:
         try:
             async with aiofiles.open(self.config_path, 'r', encoding='utf-8') as f:
                 content = await f.read()
-                self.config = json.loads(content)
-            logger.info(f"Successfully loaded config file: {self.config_path}")
+                self.config = _json.loads(content)
+            self._index_app_args(self.config)
+            logger.info("Successfully loaded config file: %s", self.config_path)
         except Exception as e:
-            logger.error(f"Failed to load config file: {e}")
+            logger.error("Failed to load config file: %s", e)
             raise
 
+    @staticmethod
+    def _index_app_args(config):
+        """Attach a flag->value index per app so later loops skip arg rescans"""
+        for app_config in config.values():
+            app_config["_parsed"] = {
+                k: v for k, v in (a.split("=", 1) for a in app_config["args"] if "=" in a)
+            }
+
     async def async_run_benchmark(self):
         """Asynchronously run all benchmark tasks concurrently"""
         results = {}
         tasks = []
-        task_map = {}  # task -> (app_name, model_name, test_case_file)
-        for app_name, app_config in self.config.items():
-            results[app_name] = {}
-            # 1. Load all models
-            model_cfg_path = None
-            for arg in app_config["args"]:
-                if arg.startswith("--model=") or arg.startswith("--models="):
-                    model_cfg_path = arg.split("=", 1)[1]
-            if not model_cfg_path:
-                logger.error(f"No model config path found for app {app_name}")
-                continue
-            async with aiofiles.open(model_cfg_path, 'r', encoding='utf-8') as f:
-                models = json.loads(await f.read())
-            # 2. Load all test cases
-            test_cases_dir = None
-            for arg in app_config["args"]:
-                if arg.startswith("--test_cases="):
-                    test_cases_dir = arg.split("=", 1)[1]
-            if not test_cases_dir:
-                logger.error(f"No test_cases dir found for app {app_name}")
-                continue
-            test_case_files = [f for f in os.listdir(test_cases_dir) if f.endswith('.json')]
-            # 3. Iterate over models and test cases
-            for model_name in models.keys():
-                results[app_name][model_name] = {}
-                for test_case_file in test_case_files:
-                    command = [app_config["command"]] + [a for a in app_config["args"]]
-                    if any(a.startswith("--model=") for a in command):
-                        command.append(f"--model_name={model_name}")
-                    elif any(a.startswith("--models=") for a in command):
-                        command.append(f"--model_name={model_name}")
-                    command.append(f"--test_case_name={test_case_file}")
-                    app_config_with_case = dict(app_config)
-                    app_config_with_case["args"] = list(app_config["args"]) + [f"--test_case_name={test_case_file}"]
-                    logger.info(f"Running: {app_name} | {model_name} | {test_case_file}")
-                    processor = BenchmarkProcessor(embedding_model=self.embedding_model, embedding_threshold=self.embedding_threshold)
-                    coro = processor.async_process_app(command, app_config_with_case, app_name)
-                    task = asyncio.create_task(coro)
-                    tasks.append(task)
-                    task_map[task] = (app_name, model_name, test_case_file)
-        # Wait for all tasks concurrently
-        finished = await asyncio.gather(*tasks)
-        # Assemble results
-        for task, result in zip(tasks, finished):
-            app_name, model_name, test_case_file = task_map[task]
-            result["model_name"] = model_name
-            result["test_case_file"] = test_case_file
-            results[app_name][model_name][test_case_file] = result
+        # Bound concurrency so large matrices don't spawn hundreds of subprocesses at once
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Eager tasks (3.12+) let cache hits and early errors resolve without
+        # a trip through the event loop; older interpreters keep lazy tasks
+        if hasattr(asyncio, 'eager_task_factory'):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        # aiofiles and to_thread share the default executor; size it for the
+        # fan-out instead of relying on asyncio's min(32, cpus + 4) default
+        if self.thread_pool_size:
+            asyncio.get_running_loop().set_default_executor(
+                ThreadPoolExecutor(max_workers=self.thread_pool_size, thread_name_prefix='mfcs-io')
+            )
+        # One processor serves every task; async_process_app keeps no per-task state
+        processor = BenchmarkProcessor(
+            embedding_model=self.embedding_model,
+            embedding_threshold=self.embedding_threshold,
+            precomputed_embeddings=self.expected_embeddings
+        )
+        cache_paths = {}  # (app_name, model_name, test_case_file) -> cache file to fill
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+        async def bounded(key, coro):
+            async with semaphore:
+                return key, await coro
+
+        # Warm the model-config and test-case caches in parallel worker threads
+        # so the scheduling loop below never blocks the event loop on disk
+        warmers = []
+        for app_config in self.config.values():
+            parsed = app_config["_parsed"]
+            model_path = parsed.get("--model") or parsed.get("--models")
+            if model_path:
+                warmers.append(asyncio.to_thread(_load_json_cached, model_path))
+            if "--test_cases" in parsed:
+                warmers.append(asyncio.to_thread(_list_test_cases, parsed["--test_cases"]))
+        # Errors surface later from the scheduling loop, in their original context
+        await asyncio.gather(*warmers, return_exceptions=True)
+
+        # TaskGroup supervises the fan-out: one failed task cancels the rest
+        async with asyncio.TaskGroup() as tg:
+            for app_name, app_config in self.config.items():
+                results[app_name] = {}
+                # 1. Load all models
+                parsed = app_config["_parsed"]
+                model_cfg_path = parsed.get("--model") or parsed.get("--models")
+                if not model_cfg_path:
+                    logger.error("No model config path found for app %s", app_name)
+                    continue
+                models = _load_json_cached(model_cfg_path)
+                # 2. Load all test cases
+                test_cases_dir = parsed.get("--test_cases")
+                if not test_cases_dir:
+                    logger.error("No test_cases dir found for app %s", app_name)
+                    continue
+                test_case_files = _list_test_cases(test_cases_dir)
+                # 3. Iterate over models and test cases
+                base_cmd = (app_config["command"], *app_config["args"])
+                has_model_flag = "--model" in parsed or "--models" in parsed
+                for model_name in models.keys():
+                    results[app_name][model_name] = {}
+                    for test_case_file in test_case_files:
+                        if self.cache_dir is not None:
+                            cache_path = self._result_cache_path(app_config, models[model_name], os.path.join(test_cases_dir, test_case_file))
+                            cached = self._load_cached_result(cache_path)
+                            if cached is not None:
+                                logger.info("Cache hit: %s | %s | %s", app_name, model_name, test_case_file)
+                                results[app_name][model_name][test_case_file] = cached
+                                continue
+                            cache_paths[(app_name, model_name, test_case_file)] = cache_path
+                        command = [*base_cmd]
+                        if has_model_flag:
+                            command.append(f"--model_name={model_name}")
+                        command.append(f"--test_case_name={test_case_file}")
+                        app_config_with_case = {**app_config, "args": [*app_config["args"], f"--test_case_name={test_case_file}"]}
+                        logger.info("Running: %s | %s | %s", app_name, model_name, test_case_file)
+                        coro = bounded(
+                            (app_name, model_name, test_case_file),
+                            processor.async_process_app(command, app_config_with_case, app_name)
+                        )
+                        tasks.append(tg.create_task(coro))
+            # Assemble each result as soon as its task finishes, appending it to an
+            # NDJSON sidecar so completed work survives a crash mid-run
+            ndjson_path = self._reports_path / f"results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson"
+            with open(ndjson_path, 'w', encoding='utf-8') as ndjson_fp:
+                for future in asyncio.as_completed(tasks):
+                    (app_name, model_name, test_case_file), result = await future
+                    result["model_name"] = model_name
+                    result["test_case_file"] = test_case_file
+                    results[app_name][model_name][test_case_file] = result
+                    serializable = {k: v for k, v in result.items() if not callable(v)}
+                    ndjson_fp.write(_json.dumps(serializable) + "\n")
+                    ndjson_fp.flush()
+                    cache_path = cache_paths.get((app_name, model_name, test_case_file))
+                    # Only cache successes: a cached transient failure would be
+                    # replayed as a hit on every later run
+                    if cache_path is not None and result.get("success") and "error" not in result:
+                        self._store_cached_result(cache_path, serializable)
+                    logger.info("Finished: %s | %s | %s", app_name, model_name, test_case_file)
+        logger.info("Raw results written: %s", ndjson_path)
         await self.async_generate_report(results)
 
     async def async_generate_report(self, results):
         """Generate benchmark reports"""
+        # Single timestamp for the whole report run
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        await self._async_generate_complete_report(results, timestamp)
+        report_path = self._reports_path / f"report_{timestamp}.md"
+        # Derive the formatted strings once per result; both sections reuse them
+        for models in results.values():
+            for test_cases in models.values():
+                for result in test_cases.values():
+                    result["_view"] = self._derive_view(result)
+        await self._async_generate_complete_report(results, report_path)
 
-    async def _async_generate_complete_report(self, results, timestamp):
+    async def _async_generate_complete_report(self, results, report_path):
         """Generate complete report with summary and details"""
-        report_path = os.path.join(self.reports_dir, f"report_{timestamp}.md")
-        
+
         try:
-            async with aiofiles.open(report_path, 'w', encoding='utf-8') as f:
-                await self._async_write_summary_section(f, results)
-                await self._async_write_detailed_sections(f, results)
-            
-            logger.info(f"Report generated: {report_path}")
+            # Build the whole report in memory, then write it in one call
+            buf = io.StringIO()
+            self._write_summary_section(buf, results)
+            self._write_detailed_sections(buf, results)
+            # Encode once and write raw bytes: a single write with no codec on the file object
+            data = buf.getvalue().encode('utf-8')
+            async with aiofiles.open(report_path, 'wb') as f:
+                await f.write(data)
+
+            logger.info("Report generated: %s", report_path)
             
         except Exception as e:
-            logger.error(f"Failed to generate report: {e}")
+            logger.error("Failed to generate report: %s", e)
             raise
 
-    async def _async_write_summary_section(self, f, results):
+    @staticmethod
+    def _derive_view(result):
+        """Precompute the formatted strings a result contributes to the report"""
+        analysis = result["analysis"]
+        success = result.get('success', False)
+        tool_usage = analysis.get("tool_usage", "none")
+        test_case = result.get("test_case", {})
+        return {
+            "input_json": _json.dumps(test_case.get('input', {})),
+            "expected_json": _json.dumps(test_case.get('expected_output', {}), indent=True),
+            "accuracy": _pct(analysis.get('accuracy', 0.0)),
+            "response_time": f"{result['execution_time']:.2f}s",
+            "pass_rate": _pct(100.0 if success else 0.0),
+            "tool_usage": tool_usage,
+            "tool_usage_display": "none" if tool_usage == "none" else _pct(100.0 if tool_usage != 'no' else 0.0),
+            "required_content": analysis.get("required_content", "none"),
+            "semantic_match": analysis.get("semantic_match", "none"),
+            "status": "✅ Pass" if success else "❌ Fail",
+        }
+
+    @staticmethod
+    def get_summary_stats(results):
+        """Aggregate pass/accuracy/time totals over all results in one pass"""
+        total = passed = 0
+        total_time = total_accuracy = 0.0
+        for models in results.values():
+            for test_cases in models.values():
+                for result in test_cases.values():
+                    analysis = result.get("analysis", {})
+                    total += 1
+                    passed += bool(result.get("success"))
+                    total_time += result.get("execution_time", 0.0)
+                    total_accuracy += analysis.get("accuracy", 0.0)
+        denom = max(total, 1)
+        return {
+            "total": total,
+            "passed": passed,
+            "failed": total - passed,
+            "pass_rate": 100.0 * passed / denom,
+            "avg_accuracy": total_accuracy / denom,
+            "avg_response_time": total_time / denom,
+        }
+
+    def _write_summary_section(self, f, results):
         """Write the summary section of the report"""
-        await f.write("# MFCS Evaluation Report\n\n")
-        await f.write("## Summary\n\n")
-        await f.write("| App Name | Model | Test Case | Accuracy | Response Time | Pass Rate | Tool Usage | Result |\n")
-        await f.write("|----------|--------|-----------|----------|---------------|-----------|------------|--------|\n")
+        rows = []
         for app_name, models in results.items():
             for model_name, test_cases in models.items():
                 model_display = self.get_model_display_name(model_name)
                 for test_case_file, result in test_cases.items():
-                    analysis = result["analysis"]
-                    accuracy = f"{analysis.get('accuracy', 0.0):.2f}%"
-                    avg_response_time = f"{result['execution_time']:.2f}s"
-                    test_case_success = f"{(100.0 if result.get('success', False) else 0.0):.2f}%"
-                    tool_usage = analysis.get("tool_usage", "none")
-                    tool_usage_display = "none" if tool_usage == "none" else f"{100.0 if tool_usage != 'no' else 0.0:.2f}%"
-                    status = "✅ Pass" if result.get('success', False) else "❌ Fail"
-                    await f.write(f"| {app_name} | {model_display} | {test_case_file} | {accuracy} | {avg_response_time} | {test_case_success} | {tool_usage_display} | {status} |\n")
-        await f.write("\n---\n\n")
-
-    async def _async_write_detailed_sections(self, f, results):
+                    view = result["_view"]
+                    rows.append((
+                        app_name, model_display, test_case_file,
+                        view["accuracy"], view["response_time"], view["pass_rate"],
+                        view["tool_usage_display"], view["status"]
+                    ))
+        f.write(SUMMARY_TITLE)
+        wrote_table = False
+        if _pd is not None and rows:
+            try:
+                f.write(_pd.DataFrame(rows, columns=list(SUMMARY_COLUMNS)).to_markdown(index=False))
+                f.write("\n")
+                wrote_table = True
+            except ImportError:
+                # to_markdown needs tabulate; fall back to the manual renderer
+                pass
+        if not wrote_table:
+            f.write(SUMMARY_TABLE_HEADER)
+            for row in rows:
+                f.write(SUMMARY_ROW_TMPL.format(*row))
+        stats = self.get_summary_stats(results)
+        f.write(
+            f"\n**Overall**: {stats['passed']}/{stats['total']} passed "
+            f"({_pct(stats['pass_rate'])}), average accuracy {_pct(stats['avg_accuracy'])}, "
+            f"average response time {stats['avg_response_time']:.2f}s\n"
+        )
+        f.write("\n---\n\n")
+
+    def _write_detailed_sections(self, f, results):
         """Write the detailed sections for each app"""
+        eval_date = datetime.now().strftime('%Y-%m-%d')
         for app_name, models in results.items():
-            await f.write(f"# {app_name}\n\n")
+            f.write(f"# {app_name}\n\n")
             for model_name, test_cases in models.items():
                 model_display = self.get_model_display_name(model_name)
-                await f.write(f"## {model_display}\n\n")
-                await f.write(f"### Test Overview\n\n")
-                await f.write(f"- **Model**: {model_display}\n")
-                await f.write(f"- **Evaluation Time**: {datetime.now().strftime('%Y-%m-%d')}\n")
-                await f.write(f"- **Test Cases**: {len(test_cases)}\n\n")
-                await f.write(f"### Test Results\n\n")
-                await f.write("| Test Case | Tool Usage | Required Content | Semantic Match | Accuracy |\n")
-                await f.write("|-----------|------------|------------------|----------------|----------|\n")
+                f.write(f"## {model_display}\n\n")
+                f.write(f"### Test Overview\n\n")
+                f.write(f"- **Model**: {model_display}\n")
+                f.write(f"- **Evaluation Time**: {eval_date}\n")
+                f.write(f"- **Test Cases**: {len(test_cases)}\n\n")
+                f.write(f"### Test Results\n\n")
+                f.write(DETAIL_TABLE_HEADER)
                 for test_case_file, result in test_cases.items():
-                    analysis = result["analysis"]
-                    tool_usage = analysis.get("tool_usage", "none")
-                    required_content = analysis.get("required_content", "none")
-                    semantic_match = analysis.get("semantic_match", "none")
-                    accuracy = f"{analysis.get('accuracy', 0.0):.2f}%"
-                    await f.write(f"| {test_case_file} | {tool_usage} | {required_content} | {semantic_match} | {accuracy} |\n")
-                await f.write("\n")
+                    view = result["_view"]
+                    f.write(f"| {test_case_file} | {view['tool_usage']} | {view['required_content']} | {view['semantic_match']} | {view['accuracy']} |\n")
+                f.write("\n")
                 for test_case_file, result in test_cases.items():
-                    test_case = result.get("test_case", {})
-                    analysis = result["analysis"]
-                    await f.write(f"#### {test_case_file}\n\n")
-                    await f.write(f"**Input**: `{json.dumps(test_case.get('input', {}), ensure_ascii=False)}`\n\n")
-                    await f.write(f"**Expected Output**: \n```json\n{json.dumps(test_case.get('expected_output', {}), ensure_ascii=False, indent=2)}\n```\n\n")
-                    await f.write("**Actual Output**:\n```\n")
+                    view = result["_view"]
+                    f.write(f"#### {test_case_file}\n\n")
+                    f.write(f"**Input**: `{view['input_json']}`\n\n")
+                    f.write(f"**Expected Output**: \n```json\n{view['expected_json']}\n```\n\n")
+                    f.write("**Actual Output**:\n```\n")
                     if result.get("stdout"):
-                        await f.write(result["stdout"])
-                    await f.write("```\n\n")
-                    await f.write(f"- **Accuracy**: {analysis.get('accuracy', 0.0):.2f}%\n")
-                    await f.write(f"- **Tool Usage**: {analysis.get('tool_usage', 'none')}\n")
-                    await f.write(f"- **Required Content Match**: {analysis.get('required_content', 'none')}\n")
-                    await f.write(f"- **Semantic Match**: {analysis.get('semantic_match', 'none')}\n\n")
-                await f.write("---\n\n")
+                        f.write(result["stdout"])
+                    f.write("```\n\n")
+                    f.write(f"- **Accuracy**: {view['accuracy']}\n")
+                    f.write(f"- **Tool Usage**: {view['tool_usage']}\n")
+                    f.write(f"- **Required Content Match**: {view['required_content']}\n")
+                    f.write(f"- **Semantic Match**: {view['semantic_match']}\n\n")
+                f.write("---\n\n")
 
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments"""
@@ -260,6 +528,32 @@ def parse_args() -> argparse.Namespace:
         help="Enable verbose logging"
     )
 
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for cached results keyed by app/model/test-case content (caching is off unless set)"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the on-disk result cache"
+    )
+
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="Maximum number of concurrent benchmark tasks (default: MFCS_MAX_CONCURRENCY env var or 16)"
+    )
+
+    parser.add_argument(
+        "--thread-pool-size",
+        type=int,
+        default=None,
+        help="Worker count for the event loop's default thread pool (default: MFCS_THREAD_POOL_SIZE env var or asyncio's default)"
+    )
+
     parser.add_argument(
         "--embedding-model",
         default=None,
@@ -281,19 +575,30 @@ def main() -> int:
     
     # Setup logging
     setup_logging(args.verbose)
-    
+
+    # Prefer the libuv-backed loop when installed; the stdlib loop works fine
+    try:
+        import uvloop
+        uvloop.install()
+        logger.debug("uvloop event loop policy installed")
+    except ImportError:
+        pass
+
     try:
         runner = BenchmarkRunner(
             config_path=args.config,
             reports_dir=args.reports_dir,
             embedding_model_name_or_path=args.embedding_model,
-            embedding_threshold=args.embedding_threshold
+            embedding_threshold=args.embedding_threshold,
+            max_concurrency=args.max_concurrency,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            thread_pool_size=args.thread_pool_size
         )
         asyncio.run(runner.async_run_benchmark())
         return 0
         
     except Exception as e:
-        logger.error(f"Benchmark failed: {e}")
+        logger.error("Benchmark failed: %s", e)
         return 1
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+"""
+JSON serialization helpers for the benchmark tool
+
+Picks the fastest available backend at import time (orjson, then ujson,
+then the stdlib json module) so callers get the speedup when the wheel is
+installed and degrade gracefully when it is not.
+"""
+
+try:
+    import orjson as _orjson
+
+    loads = _orjson.loads
+    JSONDecodeError = _orjson.JSONDecodeError
+
+    def dumps(obj, indent=False):
+        """Serialize obj to a JSON string (UTF-8 preserved)"""
+        option = _orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= _orjson.OPT_INDENT_2
+        return _orjson.dumps(obj, option=option).decode()
+
+except ImportError:
+    try:
+        import ujson as _ujson
+
+        def loads(data):
+            """Deserialize JSON from a str, bytes or buffer object"""
+            if isinstance(data, memoryview):
+                data = data.tobytes()
+            return _ujson.loads(data)
+
+        JSONDecodeError = ValueError
+
+        def dumps(obj, indent=False):
+            """Serialize obj to a JSON string (UTF-8 preserved)"""
+            return _ujson.dumps(obj, ensure_ascii=False, indent=2 if indent else 0)
+
+    except ImportError:
+        import json as _stdlib_json
+
+        def loads(data):
+            """Deserialize JSON from a str, bytes or buffer object"""
+            if isinstance(data, memoryview):
+                data = data.tobytes()
+            return _stdlib_json.loads(data)
+
+        JSONDecodeError = _stdlib_json.JSONDecodeError
+
+        def dumps(obj, indent=False):
+            """Serialize obj to a JSON string (UTF-8 preserved)"""
+            return _stdlib_json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+__all__ = ['dumps', 'loads', 'JSONDecodeError']